@@ -0,0 +1,78 @@
+-- Deterministic per-incident key for admin_alerts upserts.
+-- The old (alert_type, event_id, organizer_id) constraint never conflicts for
+-- login-fail alerts (event_id is NULL), so every detector run inserted a new row.
+
+ALTER TABLE public.admin_alerts ADD COLUMN IF NOT EXISTS dedup_key TEXT;
+
+-- When an alert was resolved; save_alert does not reopen an incident that was
+-- resolved within its detector's lookback window unless its risk score rose
+ALTER TABLE public.admin_alerts ADD COLUMN IF NOT EXISTS resolved_at TIMESTAMPTZ;
+
+UPDATE public.admin_alerts
+SET resolved_at = updated_at
+WHERE is_resolved IS TRUE AND resolved_at IS NULL;
+
+UPDATE public.admin_alerts
+SET dedup_key = CASE alert_type
+    WHEN 'Multiple Failed Logins'
+        THEN concat_ws(':', alert_type, coalesce(user_id::text, ''), coalesce(organizer_id::text, ''))
+    WHEN 'New High-Value Event'
+        THEN concat_ws(':', alert_type, coalesce(event_id::text, ''), coalesce(organizer_id::text, ''))
+    ELSE concat_ws(':', alert_type, coalesce(user_id::text, ''), coalesce(event_id::text, ''), coalesce(organizer_id::text, ''))
+END
+WHERE dedup_key IS NULL;
+
+-- Collapse the duplicate open rows left behind by the old upsert, keeping the latest
+DELETE FROM public.admin_alerts aa
+USING public.admin_alerts newer
+WHERE aa.dedup_key = newer.dedup_key
+  AND aa.is_resolved IS NOT TRUE AND newer.is_resolved IS NOT TRUE
+  AND (aa.created_at, aa.id) < (newer.created_at, newer.id);
+
+-- Drop the old (alert_type, event_id, organizer_id) uniqueness: save_alert only
+-- names dedup_key in ON CONFLICT, so any other unique violation would abort the write.
+-- Its name is not fixed across environments, so look it up by column set.
+DO $$
+DECLARE
+    old_columns TEXT[] := ARRAY['alert_type', 'event_id', 'organizer_id'];
+    rec RECORD;
+BEGIN
+    FOR rec IN
+        SELECT con.conname
+        FROM pg_constraint con
+        WHERE con.conrelid = 'public.admin_alerts'::regclass
+          AND con.contype = 'u'
+          AND (
+              SELECT array_agg(att.attname::TEXT ORDER BY att.attname)
+              FROM pg_attribute att
+              WHERE att.attrelid = con.conrelid AND att.attnum = ANY (con.conkey)
+          ) = (SELECT array_agg(c ORDER BY c) FROM unnest(old_columns) AS c)
+    LOOP
+        EXECUTE format('ALTER TABLE public.admin_alerts DROP CONSTRAINT %I', rec.conname);
+    END LOOP;
+
+    FOR rec IN
+        SELECT idx.indexrelid::regclass AS index_name
+        FROM pg_index idx
+        WHERE idx.indrelid = 'public.admin_alerts'::regclass
+          AND idx.indisunique AND NOT idx.indisprimary
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = idx.indexrelid)
+          AND (
+              SELECT array_agg(att.attname::TEXT ORDER BY att.attname)
+              FROM pg_attribute att
+              WHERE att.attrelid = idx.indrelid AND att.attnum = ANY (idx.indkey::SMALLINT[])
+          ) = (SELECT array_agg(c ORDER BY c) FROM unnest(old_columns) AS c)
+    LOOP
+        EXECUTE format('DROP INDEX %s', rec.index_name);
+    END LOOP;
+END;
+$$;
+
+-- One open incident per key; resolving an alert lets a later occurrence open a new one
+CREATE UNIQUE INDEX IF NOT EXISTS admin_alerts_open_dedup_key_uidx
+    ON public.admin_alerts (dedup_key)
+    WHERE is_resolved IS NOT TRUE;
+
+CREATE INDEX IF NOT EXISTS admin_alerts_resolved_dedup_key_idx
+    ON public.admin_alerts (dedup_key, resolved_at DESC)
+    WHERE is_resolved IS TRUE;
@@ -0,0 +1,174 @@
+-- Range-partition admin_alerts by created_at (monthly).
+-- Partitions are named admin_alerts_pYYYYMM; apps/admin/services/alert_partitions.py
+-- keeps future partitions created and archives old fully-resolved ones.
+--
+-- Postgres requires every unique index on a partitioned table to include the
+-- partition key, so the open-incident uniqueness from 001 becomes a plain
+-- partial index and save_alert serializes per dedup_key with an advisory lock.
+
+BEGIN;
+
+CREATE SCHEMA IF NOT EXISTS admin_archive;
+
+CREATE OR REPLACE FUNCTION public.admin_alerts_create_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    lower_bound DATE := date_trunc('month', month_start)::DATE;
+    upper_bound DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'admin_alerts_p' || to_char(lower_bound, 'YYYYMM');
+BEGIN
+    IF to_regclass('public.' || partition_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE public.%I PARTITION OF public.admin_alerts FOR VALUES FROM (%L) TO (%L)',
+            partition_name, lower_bound, upper_bound
+        );
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE public.admin_alerts RENAME TO admin_alerts_legacy;
+DROP INDEX IF EXISTS public.admin_alerts_open_dedup_key_uidx;
+
+CREATE TABLE public.admin_alerts (
+    LIKE public.admin_alerts_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (created_at);
+
+ALTER TABLE public.admin_alerts ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE public.admin_alerts ADD PRIMARY KEY (id, created_at);
+CREATE INDEX admin_alerts_created_at_idx ON public.admin_alerts (created_at DESC);
+CREATE INDEX admin_alerts_open_dedup_key_idx
+    ON public.admin_alerts (dedup_key)
+    WHERE is_resolved IS NOT TRUE;
+
+-- No DEFAULT partition on purpose: an insert outside the pre-made months fails
+-- loudly instead of piling rows into a catch-all that blocks creating that
+-- month later (and rules out DETACH PARTITION ... CONCURRENTLY).
+
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT gs::DATE
+        FROM generate_series(
+            (SELECT date_trunc('month', coalesce(min(created_at)::DATE, current_date)) FROM public.admin_alerts_legacy),
+            date_trunc('month', current_date) + INTERVAL '2 months',
+            INTERVAL '1 month'
+        ) AS gs
+    LOOP
+        PERFORM public.admin_alerts_create_partition(month_start);
+    END LOOP;
+END;
+$$;
+
+INSERT INTO public.admin_alerts SELECT * FROM public.admin_alerts_legacy;
+
+-- LIKE ... INCLUDING DEFAULTS INCLUDING CONSTRAINTS only copies CHECK and NOT NULL
+-- constraints. Carry the rest of the old table over explicitly:
+--   * outgoing foreign keys (e.g. organizer_id -> organizers) are re-added as-is;
+--   * non-unique secondary indexes are recreated on the partitioned table;
+--   * table/column grants and comments are copied;
+--   * sequences owned by old columns are re-owned so they survive the DROP.
+-- Dropped on purpose:
+--   * the old single-column primary key on id and any other unique index
+--     without created_at (Postgres rejects them on a partitioned table; the
+--     (alert_type, event_id, organizer_id) one is already gone as of 001);
+--   * foreign keys from other tables into admin_alerts, which would need the
+--     full (id, created_at) key. If any exist, the DROP below fails and they
+--     have to be repointed by hand first.
+DO $$
+DECLARE
+    rec RECORD;
+BEGIN
+    FOR rec IN
+        SELECT conname, pg_get_constraintdef(oid) AS condef
+        FROM pg_constraint
+        WHERE conrelid = 'public.admin_alerts_legacy'::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE public.admin_alerts ADD CONSTRAINT %I %s', rec.conname, rec.condef);
+    END LOOP;
+
+    FOR rec IN
+        SELECT privilege_type, grantee
+        FROM information_schema.role_table_grants
+        WHERE table_schema = 'public' AND table_name = 'admin_alerts_legacy'
+          AND grantee <> current_user
+    LOOP
+        EXECUTE format(
+            'GRANT %s ON public.admin_alerts TO %s',
+            rec.privilege_type,
+            CASE WHEN rec.grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(rec.grantee) END
+        );
+    END LOOP;
+
+    FOR rec IN
+        SELECT privilege_type, grantee, column_name
+        FROM information_schema.column_privileges
+        WHERE table_schema = 'public' AND table_name = 'admin_alerts_legacy'
+          AND grantee <> current_user
+          AND (privilege_type, grantee) NOT IN (
+              SELECT privilege_type, grantee
+              FROM information_schema.role_table_grants
+              WHERE table_schema = 'public' AND table_name = 'admin_alerts_legacy'
+          )
+    LOOP
+        EXECUTE format(
+            'GRANT %s (%I) ON public.admin_alerts TO %s',
+            rec.privilege_type, rec.column_name,
+            CASE WHEN rec.grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(rec.grantee) END
+        );
+    END LOOP;
+
+    IF obj_description('public.admin_alerts_legacy'::regclass, 'pg_class') IS NOT NULL THEN
+        EXECUTE format(
+            'COMMENT ON TABLE public.admin_alerts IS %L',
+            obj_description('public.admin_alerts_legacy'::regclass, 'pg_class')
+        );
+    END IF;
+
+    FOR rec IN
+        SELECT attname, col_description(attrelid, attnum) AS comment
+        FROM pg_attribute
+        WHERE attrelid = 'public.admin_alerts_legacy'::regclass AND attnum > 0 AND NOT attisdropped
+          AND col_description(attrelid, attnum) IS NOT NULL
+    LOOP
+        EXECUTE format('COMMENT ON COLUMN public.admin_alerts.%I IS %L', rec.attname, rec.comment);
+    END LOOP;
+
+    FOR rec IN
+        SELECT column_name, pg_get_serial_sequence('public.admin_alerts_legacy', column_name) AS seq
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'admin_alerts_legacy'
+    LOOP
+        IF rec.seq IS NOT NULL THEN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY public.admin_alerts.%I', rec.seq, rec.column_name);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Index names are schema-wide, so capture the old definitions and recreate
+-- them once the legacy table (and its indexes) is gone
+CREATE TEMP TABLE admin_alerts_legacy_indexes ON COMMIT DROP AS
+SELECT i.indexrelid::regclass::TEXT AS index_name, pg_get_indexdef(i.indexrelid) AS index_def
+FROM pg_index i
+WHERE i.indrelid = 'public.admin_alerts_legacy'::regclass
+  AND NOT i.indisunique
+  AND i.indexrelid::regclass::TEXT NOT IN (
+      'admin_alerts_created_at_idx', 'admin_alerts_open_dedup_key_idx'
+  );
+
+DROP TABLE public.admin_alerts_legacy;
+
+DO $$
+DECLARE
+    rec RECORD;
+BEGIN
+    FOR rec IN SELECT index_name, index_def FROM admin_alerts_legacy_indexes LOOP
+        EXECUTE replace(rec.index_def, ' ON public.admin_alerts_legacy ', ' ON public.admin_alerts ');
+    END LOOP;
+END;
+$$;
+
+COMMIT;
@@ -0,0 +1,6 @@
+-- Indexes behind fetch_alerts_validator (conditional GET on the alerts list):
+-- MAX(updated_at) on each table becomes a single index probe.
+
+CREATE INDEX IF NOT EXISTS admin_alerts_updated_at_idx ON public.admin_alerts (updated_at);
+CREATE INDEX IF NOT EXISTS organizers_updated_at_idx ON public.organizers (updated_at);
+CREATE INDEX IF NOT EXISTS events_updated_at_idx ON public.events (updated_at);
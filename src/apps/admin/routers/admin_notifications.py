@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Depends, Query
-from db import get_db_session
+from fastapi import APIRouter, Depends, Header, Query
+from db import get_db_session, get_read_db_session, with_read_fallback
 from apps.admin.services.admin_notifications import *
+from apps.admin.services.login_fail_stream import record_login_failure
+from apps.admin.services.http_cache import (
+    cached_json_response,
+    etag_matches,
+    make_etag,
+    not_modified_response,
+)
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -22,15 +29,31 @@ class AlertResponse(BaseModel):
 
 
 @router.get("/alerts/{alert_id}")
-def alert_detail(alert_id: str, db: Session = Depends(get_db_session)):
-    data = get_alert_details(alert_id, db)
-    if not data:
-        raise HTTPException(status_code=404, detail="Alert not found")
+def alert_detail(
+    alert_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db_session),
+):
+    def read(db: Session):
+        validator = get_alert_validator(alert_id, db)
+        if not validator:
+            raise HTTPException(status_code=404, detail="Alert not found")
+
+        last_modified = validator["updated_at"]
+        etag = make_etag("alert_detail", alert_id, last_modified)
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag, last_modified)
 
-    return data
-    return data
+        return cached_json_response(etag, last_modified, lambda: get_alert_details(alert_id, db))
+
+    return with_read_fallback(db, read)
     # return AlertRiskResponse(**data)
 
+@router.post("/login-failures")
+def ingest_login_failure(event: LoginFailureEvent, db: Session = Depends(get_db_session)):
+    """Push a login failure as it happens; raises the login-fail alert on threshold crossing."""
+    return record_login_failure(db, event.user_id, event.occurred_at)
+
 @router.post("/alerts/{alert_id}/investigate")
 def investigate_further():
     return {"message": "This API is not implemented yet"}
@@ -47,22 +70,46 @@ def list_alerts(
     risk_category: Optional[RiskCategory] = Query(None, description="Filter by risk category"),
     duration_hours: Optional[int] = Query(None, ge=1, le=168, description="Filter alerts created in the last N hours (e.g., 1, 12, 24)"),
     popup: bool = Query(False, description="If true, return unseen alert (limit 1)"),
-    db: Session = Depends(get_db_session),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db_session),
 ):
-    alerts = fetch_alerts(
-        db=db,
-        skip=skip,
-        limit=limit,
-        alert_type=alert_type,
-        risk_category=risk_category,
-        duration_hours=duration_hours,
-        popup=popup,
-    )
-
-    if not alerts:
-        raise HTTPException(status_code=404, detail="Alert not found")
-
-    return alerts
+    def read(db: Session):
+        validator = fetch_alerts_validator(
+            db=db,
+            alert_type=alert_type,
+            risk_category=risk_category,
+            duration_hours=duration_hours,
+        )
+        if not validator["row_count"]:
+            raise HTTPException(status_code=404, detail="Alert not found")
+
+        last_modified = validator["last_modified"]
+        etag = make_etag(
+            "list_alerts", skip, limit, alert_type, risk_category, duration_hours, popup,
+            validator["row_count"], last_modified,
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag, last_modified)
+
+        def render():
+            alerts = fetch_alerts(
+                db=db,
+                skip=skip,
+                limit=limit,
+                alert_type=alert_type,
+                risk_category=risk_category,
+                duration_hours=duration_hours,
+                popup=popup,
+            )
+
+            if not alerts:
+                raise HTTPException(status_code=404, detail="Alert not found")
+
+            return alerts
+
+        return cached_json_response(etag, last_modified, render)
+
+    return with_read_fallback(db, read)
 
 
 
@@ -1,11 +1,20 @@
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# Entity columns that identify one ongoing incident per alert type
+DEDUP_KEY_FIELDS = {
+    "Multiple Failed Logins": ("user_id", "organizer_id"),
+    "Mass Refund": ("user_id", "event_id", "organizer_id"),
+    "Suspicious Bulk Purchase": ("user_id", "event_id", "organizer_id"),
+    "New High-Value Event": ("event_id", "organizer_id"),
+}
 
 class AdminAlert(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+    id: Optional[UUID] = None
+    dedup_key: Optional[str] = None
     alert_type: Optional[str] = None
     user_id: Optional[UUID] = None
     event_id: Optional[UUID] = None
@@ -20,6 +29,25 @@ class AdminAlert(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @model_validator(mode="after")
+    def set_dedup_key(self):
+        if self.dedup_key is None and self.alert_type:
+            fields = DEDUP_KEY_FIELDS.get(self.alert_type, ("user_id", "event_id", "organizer_id"))
+            parts = [str(getattr(self, f) or "") for f in fields]
+            self.dedup_key = ":".join([self.alert_type, *parts])
+        return self
+
+class DetectorConfig(BaseModel):
+    interval_minutes: float = 5
+    lookback_hours: Optional[float] = None
+    threshold: Optional[float] = None
+    timeout_seconds: int = 60
+    enabled: bool = True
+
+class LoginFailureEvent(BaseModel):
+    user_id: UUID
+    occurred_at: Optional[datetime] = None
+
 class RiskCategory(str, Enum):
     Low = "Low"
     Moderate = "Moderate"
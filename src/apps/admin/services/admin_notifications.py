@@ -1,3 +1,7 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
@@ -208,56 +212,205 @@ def detect_suspicious_bulk_purchase(
     return notifications
 
 
+# ==============================
+# Detector Registry
+# ==============================
+DETECTOR_FUNCTIONS = {
+    "Multiple Failed Logins": detect_multiple_login_fails,
+    "Mass Refund": detect_mass_refunds,
+    "Suspicious Bulk Purchase": detect_suspicious_bulk_purchase,
+    "New High-Value Event": detect_high_value_event,
+}
+
+def load_detectors() -> dict:
+    """Registry of every detector; config entries override the DetectorConfig defaults."""
+    configured = load_config("detector_config.json").get("detectors", {})
+    unknown = set(configured) - set(DETECTOR_FUNCTIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown detector(s) in detector_config.json: {sorted(unknown)}. "
+            f"Expected one of: {sorted(DETECTOR_FUNCTIONS)}"
+        )
+    return {
+        name: DetectorConfig(**configured.get(name, {}))
+        for name in DETECTOR_FUNCTIONS
+    }
+
+
+DETECTORS = load_detectors()
+
+
+def detector_params(name: str) -> dict:
+    """Effective keyword arguments for a detector: configured values over the function defaults."""
+    detector = DETECTORS[name]
+    signature = inspect.signature(DETECTOR_FUNCTIONS[name])
+    params = {
+        key: param.default
+        for key, param in signature.parameters.items()
+        if key in ("hours", "threshold")
+    }
+    if detector.lookback_hours is not None:
+        params["hours"] = detector.lookback_hours
+    if detector.threshold is not None and "threshold" in params:
+        params["threshold"] = detector.threshold
+    return params
+
+
+def run_detector(db: Session, name: str) -> List[dict]:
+    """Run a single registered detector with its configured window, threshold and timeout."""
+    detector = DETECTORS[name]
+    # Transaction-local, so the timeout never leaks into other users of the connection
+    db.execute(
+        text("SELECT set_config('statement_timeout', :timeout, true)"),
+        {"timeout": str(detector.timeout_seconds * 1000)}
+    )
+    return DETECTOR_FUNCTIONS[name](db, **detector_params(name))
+
+
 def detect_combined_alerts(db: Session) -> List[dict]:
     """Combine multiple alert detection functions."""
-    return (
-        detect_high_value_event(db)
-        + detect_multiple_login_fails(db)
-        + detect_mass_refunds(db)
-        + detect_suspicious_bulk_purchase(db)
-    )
+    alerts = []
+    for name, detector in DETECTORS.items():
+        if detector.enabled:
+            alerts += run_detector(db, name)
+    return alerts
+
+
+# ==============================
+# Alert Suppression Cache
+# ==============================
+# dedup_key -> (risk_score, cached_at). Writes whose risk score has not moved
+# since the last cycle are skipped; the TTL re-syncs with the table periodically.
+SUPPRESSION_TTL_SECONDS = 60 * 60
+SUPPRESSION_MAX_ENTRIES = 10_000
+
+_suppression_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_suppression_lock = threading.Lock()
+
+
+def is_alert_suppressed(dedup_key: str, risk_score: Optional[float]) -> bool:
+    with _suppression_lock:
+        cached = _suppression_cache.get(dedup_key)
+        if cached is None:
+            return False
+        cached_score, cached_at = cached
+        if time.monotonic() - cached_at > SUPPRESSION_TTL_SECONDS:
+            del _suppression_cache[dedup_key]
+            return False
+        return cached_score == risk_score
+
+
+def remember_alert(dedup_key: str, risk_score: Optional[float]):
+    with _suppression_lock:
+        _suppression_cache[dedup_key] = (risk_score, time.monotonic())
+        _suppression_cache.move_to_end(dedup_key)
+        while len(_suppression_cache) > SUPPRESSION_MAX_ENTRIES:
+            _suppression_cache.popitem(last=False)
+
+
+def forget_alert(dedup_key: Optional[str]):
+    if not dedup_key:
+        return
+    with _suppression_lock:
+        _suppression_cache.pop(dedup_key, None)
 
 
 # ==============================
 # Alert Persistence
 # ==============================
 def save_alert(db: Session, alert: dict):
-    """Insert or update alert in database."""
+    """Insert or update the open alert for the alert's dedup key."""
+    dedup_key = alert.get("dedup_key")
+    if dedup_key and is_alert_suppressed(dedup_key, alert.get("risk_score")):
+        return
+
+    params = {
+        "alert_type": alert.get("alert_type"),
+        "dedup_key": dedup_key,
+        "user_id": alert.get("user_id"),
+        "event_id": str(alert.get("event_id")) if alert.get("event_id") else None,
+        "organizer_id": str(alert.get("organizer_id")) if alert.get("organizer_id") else None,
+        "risk_score": alert.get("risk_score"),
+        "risk_category": alert.get("risk_category"),
+        "refund_count": alert.get("refund_count"),
+        "login_fail_count": alert.get("login_fail_count"),
+        "ticket_price": alert.get("ticket_price"),
+        "ticket_quantity": alert.get("ticket_quantity"),
+        "is_first_time": alert.get("is_first_time"),
+    }
+
     try:
-        db.execute(
+        # admin_alerts is partitioned by created_at, so open-incident uniqueness
+        # on dedup_key cannot be a unique index; serialize writers per key instead
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:dedup_key))"), {"dedup_key": dedup_key})
+        open_alert = db.execute(
             text("""
-                INSERT INTO public.admin_alerts (
-                    alert_type, user_id, event_id, organizer_id, refund_count, 
-                    login_fail_count, ticket_price, ticket_quantity, is_first_time, 
-                    risk_score, risk_category
-                )
-                VALUES (
-                    :alert_type, :user_id, :event_id, :organizer_id, :refund_count, 
-                    :login_fail_count, :ticket_price, :ticket_quantity, :is_first_time, 
-                    :risk_score, :risk_category
-                )
-                ON CONFLICT (alert_type, event_id, organizer_id) DO UPDATE SET
-                    refund_count = EXCLUDED.refund_count,
-                    risk_score = EXCLUDED.risk_score,
-                    updated_at = NOW()
-                WHERE admin_alerts.risk_score IS DISTINCT FROM EXCLUDED.risk_score;
+                SELECT id, created_at, risk_score FROM public.admin_alerts
+                WHERE dedup_key = :dedup_key AND is_resolved IS NOT TRUE
+                ORDER BY created_at DESC
+                LIMIT 1
             """),
-            {
-                "alert_type": alert.get("alert_type"),
-                "user_id": alert.get("user_id"),
-                "event_id": str(alert.get("event_id")) if alert.get("event_id") else None,
-                "organizer_id": str(alert.get("organizer_id")) if alert.get("organizer_id") else None,
-                "risk_score": alert.get("risk_score"),
-                "risk_category": alert.get("risk_category"),
-                "refund_count": alert.get("refund_count"),
-                "login_fail_count": alert.get("login_fail_count"),
-                "ticket_price": alert.get("ticket_price"),
-                "ticket_quantity": alert.get("ticket_quantity"),
-                "is_first_time": alert.get("is_first_time"),
-            }
-        )
+            {"dedup_key": dedup_key}
+        ).mappings().first()
+
+        # Detectors re-report a condition for their whole lookback window, so a
+        # resolved alert still inside that window is not reopened unless it got worse
+        recently_resolved = False
+        if not open_alert:
+            alert_type = params["alert_type"]
+            hours = detector_params(alert_type)["hours"] if alert_type in DETECTORS else 24
+            resolved_alert = db.execute(
+                text("""
+                    SELECT risk_score FROM public.admin_alerts
+                    WHERE dedup_key = :dedup_key AND is_resolved IS TRUE
+                    AND resolved_at >= :since
+                    ORDER BY resolved_at DESC
+                    LIMIT 1
+                """),
+                {"dedup_key": dedup_key, "since": datetime.now(timezone.utc) - timedelta(hours=hours)}
+            ).mappings().first()
+            recently_resolved = resolved_alert is not None and (
+                params["risk_score"] is None
+                or resolved_alert["risk_score"] is None
+                or params["risk_score"] <= resolved_alert["risk_score"]
+            )
+
+        if not open_alert and not recently_resolved:
+            db.execute(
+                text("""
+                    INSERT INTO public.admin_alerts (
+                        alert_type, dedup_key, user_id, event_id, organizer_id, refund_count, 
+                        login_fail_count, ticket_price, ticket_quantity, is_first_time, 
+                        risk_score, risk_category
+                    )
+                    VALUES (
+                        :alert_type, :dedup_key, :user_id, :event_id, :organizer_id, :refund_count, 
+                        :login_fail_count, :ticket_price, :ticket_quantity, :is_first_time, 
+                        :risk_score, :risk_category
+                    )
+                """),
+                params
+            )
+        elif open_alert and open_alert["risk_score"] != params["risk_score"]:
+            db.execute(
+                text("""
+                    UPDATE public.admin_alerts SET
+                        refund_count = :refund_count,
+                        login_fail_count = :login_fail_count,
+                        ticket_price = :ticket_price,
+                        ticket_quantity = :ticket_quantity,
+                        risk_score = :risk_score,
+                        risk_category = :risk_category,
+                        updated_at = NOW()
+                    WHERE id = :id AND created_at = :created_at
+                """),
+                {**params, "id": open_alert["id"], "created_at": open_alert["created_at"]}
+            )
         db.commit()
+        if dedup_key:
+            remember_alert(dedup_key, alert.get("risk_score"))
     except Exception as e:
+        db.rollback()
         print(f"Error saving alert: {e}")
 
 
@@ -302,6 +455,62 @@ def build_alert_response(alert: dict) -> AlertResponse:
     merged.update({"alert_title": alert_title, "alert_description": desc})
     return AlertResponse(**merged)
 
+def build_alert_filters(
+    alert_type: Optional[AlertType] = None,
+    risk_category: Optional[RiskCategory] = None,
+    duration_hours: Optional[int] = None,
+):
+    query = ""
+    params = {}
+
+    # Filter by alert type
+    if alert_type and alert_type!=AlertType.AllCategories:
+        query += " AND aa.alert_type = :alert_type"
+        params["alert_type"] = alert_type
+
+    # # Filter by risk category
+    if risk_category and risk_category!=RiskCategory.AllCategories:
+        query += " AND aa.risk_category = :risk_category"
+        params["risk_category"] = risk_category.value
+
+    # # Filter by duration (last N hours); a created_at bound lets Postgres prune partitions
+    if duration_hours:
+        since = datetime.utcnow() - timedelta(hours=duration_hours)
+        query += " AND aa.created_at >= :since"
+        params["since"] = since
+
+    return query, params
+
+
+def fetch_alerts_validator(
+    db: Session,
+    alert_type: Optional[AlertType] = None,
+    risk_category: Optional[RiskCategory] = None,
+    duration_hours: Optional[int] = None,
+):
+    """Cheap (row count, last modified) over the alerts matching the filters.
+
+    Counts admin_alerts alone (no per-row joins) so a poll answered with 304
+    costs less than the page query. The body also carries organizer and event
+    names, so the newest organizers/events updated_at is folded in as well;
+    each MAX is answered from its updated_at index (migrations/003).
+    """
+    filters, params = build_alert_filters(alert_type, risk_category, duration_hours)
+    return db.execute(
+        text(f"""
+            SELECT COUNT(*) AS row_count,
+                   GREATEST(
+                       MAX(aa.updated_at),
+                       (SELECT MAX(updated_at) FROM organizers),
+                       (SELECT MAX(updated_at) FROM events)
+                   ) AS last_modified
+            FROM public.admin_alerts aa
+            WHERE 1=1 {filters}
+        """),
+        params
+    ).mappings().first()
+
+
 def fetch_alerts(
     db: Session,
     skip: int = 0,
@@ -323,23 +532,8 @@ def fetch_alerts(
         left JOIN events e ON aa.event_id = e.id
         WHERE 1=1
     """
-    params = {}
-
-    # Filter by alert type
-    if alert_type and alert_type!=AlertType.AllCategories:
-        query += " AND aa.alert_type = :alert_type"
-        params["alert_type"] = alert_type
-
-    # # Filter by risk category
-    if risk_category and risk_category!=RiskCategory.AllCategories:
-        query += " AND aa.risk_category = :risk_category"
-        params["risk_category"] = risk_category.value
-
-    # # Filter by duration (last N hours)
-    if duration_hours:
-        since = datetime.utcnow() - timedelta(hours=duration_hours)
-        query += " AND aa.created_at >= :since"
-        params["since"] = since
+    filters, params = build_alert_filters(alert_type, risk_category, duration_hours)
+    query += filters
     # if popup==False:
     #     query += " AND aa.popup = False"
     # Pagination
@@ -350,6 +544,14 @@ def fetch_alerts(
     return [build_alert_response(alert) for alert in alerts]
 
 
+def get_alert_validator(alert_id: str, db: Session):
+    """Return the alert's updated_at, or None if it does not exist."""
+    return db.execute(
+        text("SELECT id, updated_at FROM admin_alerts WHERE id = :alert_id"),
+        {"alert_id": alert_id}
+    ).mappings().first()
+
+
 def get_alert_details(alert_id: str, db: Session):
     result = db.execute(
         text("SELECT * FROM admin_alerts WHERE id = :alert_id"),
@@ -380,7 +582,7 @@ def get_alert_details(alert_id: str, db: Session):
 # ==============================
 def mark_alert_as_resolved(db: Session, alert_id: str):
     alert = db.execute(
-        text("SELECT id, is_resolved FROM admin_alerts WHERE id = :alert_id"),
+        text("SELECT id, is_resolved, dedup_key FROM admin_alerts WHERE id = :alert_id"),
         {"alert_id": alert_id}
     ).mappings().first()
 
@@ -394,12 +596,15 @@ def mark_alert_as_resolved(db: Session, alert_id: str):
         text("""
             UPDATE admin_alerts
             SET is_resolved = true,
+                resolved_at = now(),
                 updated_at = now()
             WHERE id = :alert_id
         """),
         {"alert_id": alert_id}
     )
     db.commit()
+    # Let the next scan re-check against the resolved row (see save_alert)
+    forget_alert(alert["dedup_key"])
 
     return {"message": "Alert marked as resolved successfully", "alert_id": alert_id}
 
@@ -0,0 +1,142 @@
+import logging
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from apps.admin.services.utils import load_config
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# Load Partition Config
+# ==============================
+partition_cfg = load_config("alert_partition_config.json")
+
+PARTITION_PREFIX = "admin_alerts_p"
+MAINTENANCE_LOCK = "admin_alerts:partitions"
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+# ==============================
+# Partition Maintenance
+# ==============================
+def create_future_partitions(db: Session, months_ahead: int = None) -> List[str]:
+    """Make sure monthly partitions exist from the current month up to `months_ahead`."""
+    if months_ahead is None:
+        months_ahead = partition_cfg["premake_months"]
+
+    this_month = date.today().replace(day=1)
+    created = []
+    for offset in range(months_ahead + 1):
+        name = db.execute(
+            text("SELECT public.admin_alerts_create_partition(:month_start)"),
+            {"month_start": add_months(this_month, offset)}
+        ).scalar()
+        created.append(name)
+    db.commit()
+    return created
+
+
+def archive_resolved_partitions(db: Session, retention_months: int = None) -> List[str]:
+    """Detach monthly partitions older than the retention window into the archive schema.
+
+    A partition is only archived once every alert in it is resolved; partitions
+    that still hold open alerts stay attached so they remain visible on the dashboard.
+    """
+    if retention_months is None:
+        retention_months = partition_cfg["retention_months"]
+    archive_schema = partition_cfg["archive_schema"]
+
+    cutoff = add_months(date.today().replace(day=1), -retention_months)
+    partitions = db.execute(
+        text("""
+            SELECT c.relname, i.inhdetachpending
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            JOIN pg_namespace n ON n.oid = p.relnamespace
+            WHERE n.nspname = 'public' AND p.relname = 'admin_alerts'
+            AND c.relname LIKE :prefix
+            ORDER BY c.relname
+        """),
+        {"prefix": f"{PARTITION_PREFIX}%"}
+    ).all()
+    db.rollback()
+
+    archived = []
+    for name, detach_pending in partitions:
+        # Names come from pg_class and are checked against the fixed naming scheme
+        # before being interpolated into DDL
+        suffix = name[len(PARTITION_PREFIX):]
+        if not (len(suffix) == 6 and suffix.isdigit()):
+            continue
+        if partition_name(cutoff) <= name:
+            continue
+
+        if not detach_pending:
+            has_open = db.execute(
+                text(f'SELECT EXISTS (SELECT 1 FROM public."{name}" WHERE is_resolved IS NOT TRUE)')
+            ).scalar()
+            db.rollback()
+            if has_open:
+                logger.info(f"Partition {name} still has open alerts; keeping it attached.")
+                continue
+
+        # DETACH ... CONCURRENTLY (PG14+) only takes a SHARE UPDATE EXCLUSIVE lock,
+        # so dashboard reads and detector writes keep flowing. It cannot run inside
+        # a transaction block, hence the autocommit connection. A run interrupted
+        # midway leaves the partition "detach pending"; FINALIZE completes it.
+        detach = "FINALIZE" if detach_pending else "CONCURRENTLY"
+        with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f'ALTER TABLE public.admin_alerts DETACH PARTITION public."{name}" {detach}'))
+            conn.execute(text(f'ALTER TABLE public."{name}" SET SCHEMA "{archive_schema}"'))
+        archived.append(name)
+        logger.info(f"Partition {name} archived to {archive_schema}.")
+
+    return archived
+
+
+def maintain_alert_partitions(db: Session) -> dict:
+    """Create and archive partitions, skipping if another worker is already doing so.
+
+    Every worker starts the scheduler, so this takes a session-level advisory lock
+    on its own connection (the Session hands its connection back on each commit).
+    """
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        locked = lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(hashtext(:lock_name))"),
+            {"lock_name": MAINTENANCE_LOCK}
+        ).scalar()
+        if not locked:
+            logger.info("admin_alerts partition maintenance already running elsewhere; skipping.")
+            return {"created": [], "archived": [], "skipped": True}
+        try:
+            return {
+                "created": create_future_partitions(db),
+                "archived": archive_resolved_partitions(db),
+            }
+        finally:
+            lock_conn.execute(
+                text("SELECT pg_advisory_unlock(hashtext(:lock_name))"),
+                {"lock_name": MAINTENANCE_LOCK}
+            )
+
+
+# ==============================
+# Manual Testing Entry
+# ==============================
+if __name__ == "__main__":
+    db = SessionLocal()
+    print(maintain_alert_partitions(db))
+    db.close()
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+# ==============================
+# Conditional GET Helpers
+# ==============================
+RENDERED_CACHE_MAX_ENTRIES = 256
+
+_rendered_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_rendered_lock = threading.Lock()
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Weak validators (W/"...") still match for GET revalidation
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # admin_alerts timestamps are UTC
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def cached_json_response(etag: str, last_modified: Optional[datetime], render) -> Response:
+    """Return the rendered body for `etag`, calling `render()` only on a cache miss."""
+    with _rendered_lock:
+        body = _rendered_cache.get(etag)
+        if body is not None:
+            _rendered_cache.move_to_end(etag)
+
+    if body is None:
+        body = json.dumps(jsonable_encoder(render())).encode()
+        with _rendered_lock:
+            _rendered_cache[etag] = body
+            while len(_rendered_cache) > RENDERED_CACHE_MAX_ENTRIES:
+                _rendered_cache.popitem(last=False)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=validator_headers(etag, last_modified),
+    )
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from apps.admin.services.admin_notifications import (
+    calculate_risk_score_numeric,
+    detector_params,
+    save_alert,
+)
+from apps.admin.schemas.admin_notifications import AdminAlert
+
+LOGIN_FAIL_ALERT = "Multiple Failed Logins"
+BUCKET_SECONDS = 60
+MAX_TRACKED_USERS = 50_000
+
+
+# ==============================
+# Sliding Window Counter
+# ==============================
+class SlidingWindowCounter:
+    """Per-key event counts over a sliding window, kept as coarse time buckets.
+
+    Each key holds at most window/bucket (bucket_start, count) pairs, and the
+    least recently touched keys are evicted beyond `max_keys`, so memory stays
+    bounded however many users fail to log in.
+    """
+
+    def __init__(self, window_seconds: float, bucket_seconds: int = BUCKET_SECONDS, max_keys: int = MAX_TRACKED_USERS):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_keys = max_keys
+        self._keys: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, buckets: deque, now: float):
+        oldest = now - self.window_seconds
+        while buckets and buckets[0][0] + self.bucket_seconds <= oldest:
+            buckets.popleft()
+
+    def add(self, key: str, at: Optional[float] = None) -> tuple:
+        """Count one event for `key` and return (count in window, per-key state)."""
+        now = time.time()
+        at = now if at is None else min(at, now)
+        bucket_start = at - at % self.bucket_seconds
+
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None:
+                state = {"buckets": deque(), "organizer_ids": None, "organizers_checked_at": None}
+                self._keys[key] = state
+            self._keys.move_to_end(key)
+
+            buckets = state["buckets"]
+            self._prune(buckets, now)
+            if at > now - self.window_seconds:
+                for i in range(len(buckets) - 1, -1, -1):
+                    if buckets[i][0] == bucket_start:
+                        buckets[i][1] += 1
+                        break
+                    if buckets[i][0] < bucket_start:
+                        buckets.insert(i + 1, [bucket_start, 1])
+                        break
+                else:
+                    buckets.appendleft([bucket_start, 1])
+
+            count = sum(c for _, c in buckets)
+            self._evict(now)
+            return count, state
+
+    def _evict(self, now: float):
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        # Drop the oldest idle key each call so expired users do not linger
+        if self._keys:
+            key, state = next(iter(self._keys.items()))
+            self._prune(state["buckets"], now)
+            if not state["buckets"]:
+                del self._keys[key]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+_login_fail_params = detector_params(LOGIN_FAIL_ALERT)
+login_fail_windows = SlidingWindowCounter(window_seconds=_login_fail_params["hours"] * 3600)
+
+
+# ==============================
+# Login Failure Ingestion
+# ==============================
+def get_organizer_ids(db: Session, user_id: str) -> List:
+    return db.execute(
+        text("SELECT id FROM organizers WHERE user_id = :user_id"),
+        {"user_id": user_id}
+    ).scalars().all()
+
+
+def record_login_failure(db: Session, user_id: UUID, occurred_at: Optional[datetime] = None) -> dict:
+    """Count a login failure as it happens and raise the alert once the threshold is crossed.
+
+    Uses the same threshold, window and risk scoring as detect_multiple_login_fails,
+    which keeps running on its own schedule to reconcile anything missed here.
+    """
+    at = None
+    if occurred_at is not None:
+        if occurred_at.tzinfo is None:
+            occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+        at = occurred_at.timestamp()
+
+    user_id = str(user_id)
+    fail_count, state = login_fail_windows.add(user_id, at)
+
+    threshold = _login_fail_params["threshold"]
+    if fail_count <= threshold:
+        return {"login_fail_count": fail_count, "alert_raised": False}
+
+    # One alert per organizer row, matching the SQL detector's GROUP BY (user_id, org.id).
+    # An empty lookup is cached for one bucket only: credential stuffing against
+    # ordinary accounts stays off the DB, and a user who becomes an organizer is
+    # still picked up.
+    organizer_ids = state["organizer_ids"]
+    checked_at = state["organizers_checked_at"]
+    if organizer_ids is None or (
+        not organizer_ids and time.monotonic() - checked_at >= login_fail_windows.bucket_seconds
+    ):
+        organizer_ids = get_organizer_ids(db, user_id)
+        state["organizer_ids"] = organizer_ids
+        state["organizers_checked_at"] = time.monotonic()
+    if not organizer_ids:
+        return {"login_fail_count": fail_count, "alert_raised": False}
+
+    risk_obj = calculate_risk_score_numeric(
+        alert_type=LOGIN_FAIL_ALERT,
+        numeric_value=fail_count
+    )
+    for organizer_id in organizer_ids:
+        event = {
+            "user_id": user_id,
+            "organizer_id": organizer_id,
+            "login_fail_count": fail_count,
+            "alert_type": LOGIN_FAIL_ALERT,
+            **risk_obj
+        }
+        save_alert(db=db, alert=AdminAlert(**event).model_dump())
+    return {"login_fail_count": fail_count, "alert_raised": True}
@@ -1,16 +1,23 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from db import SessionLocal
+from db import ReadSession, SessionLocal, with_read_fallback
 from apps.admin.services.admin_notifications import (
-    detect_combined_alerts,
+    DETECTORS,
+    run_detector,
     save_alert
 )
+from apps.admin.services.alert_partitions import maintain_alert_partitions, partition_cfg
+import random
 import time
+from datetime import datetime, timedelta
 import logging
 from contextlib import contextmanager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Detectors get a first run shortly after startup, spread over this many seconds
+STARTUP_JITTER_SECONDS = 60
+
 @contextmanager
 def get_db():
     db = SessionLocal()
@@ -19,40 +26,85 @@ def get_db():
     finally:
         db.close()
 
-def scheduled_jobs():
-    with get_db() as db:
+@contextmanager
+def get_read_db():
+    db = ReadSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def run_detector_job(name: str):
+    # Detector scans read from the replica when available; alerts are written to the primary
+    with get_read_db() as read_db, get_db() as db:
         try:
-            logger.info("Running scheduled detection checks...")
-            combined_alerts = detect_combined_alerts(db)
+            logger.info(f"Running detector '{name}'...")
+            alerts = with_read_fallback(read_db, lambda db: run_detector(db, name))
 
-            if combined_alerts:
-                print(combined_alerts)
-                logger.info(f"{len(combined_alerts)} alerts detected!")
-                for alert in combined_alerts:
+            if alerts:
+                logger.info(f"{len(alerts)} '{name}' alerts detected!")
+                for alert in alerts:
                     save_alert(db=db, alert=alert)
                 logger.info("Alerts saved successfully.")
             else:
-                logger.info("No alerts detected.")
+                logger.info(f"No '{name}' alerts detected.")
 
         except Exception as e:
-            logger.error("Error during scheduled job:", exc_info=e)
+            logger.error(f"Error during detector '{name}':", exc_info=e)
+
+def partition_maintenance_job():
+    with get_db() as db:
+        try:
+            result = maintain_alert_partitions(db)
+            logger.info(f"admin_alerts partitions maintained: {result}")
+        except Exception as e:
+            logger.error("Error during partition maintenance:", exc_info=e)
+
+def add_detector_jobs(scheduler: BackgroundScheduler):
+    """Register one job per enabled detector on its own cadence."""
+    for name, detector in DETECTORS.items():
+        if not detector.enabled:
+            continue
+        # max_instances + coalesce: a slow run is never stacked or replayed,
+        # and each detector has its own job so it cannot delay the others
+        scheduler.add_job(
+            run_detector_job,
+            'interval',
+            minutes=detector.interval_minutes,
+            args=[name],
+            id=f"detector:{name}",
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=int(detector.interval_minutes * 60),
+            # Run once soon after startup (not a full interval later), jittered
+            # so the detectors do not all hit the database at the same moment
+            next_run_time=datetime.now() + timedelta(
+                seconds=random.uniform(0, min(STARTUP_JITTER_SECONDS, detector.interval_minutes * 60))
+            ),
+        )
+        logger.info(f"Detector '{name}' scheduled every {detector.interval_minutes} minutes.")
 
 def start_scheduler():
     scheduler = BackgroundScheduler()
-    scheduler.add_job(scheduled_jobs, 'interval', minutes=5)
+    add_detector_jobs(scheduler)
+    scheduler.add_job(
+        partition_maintenance_job,
+        'interval',
+        hours=partition_cfg["interval_hours"],
+        id="admin_alerts:partitions",
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.now(),
+    )
     scheduler.start()
-    logger.info("Scheduler started... running every 5 minutes.")
+    logger.info("Scheduler started.")
     return scheduler
 
 if __name__ == "__main__":
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(scheduled_jobs, 'interval', minutes=5)  # runs every 5 minutes
-    scheduler.start()
-
-    logger.info("Scheduler started... running every 5 minutes.")
+    scheduler = start_scheduler()
     try:
         while True:
             time.sleep(60)  # keep main thread alive
     except (KeyboardInterrupt, SystemExit):
         scheduler.shutdown()
-        logger.info("Scheduler stopped.")
\ No newline at end of file
+        logger.info("Scheduler stopped.")
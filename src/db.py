@@ -1,9 +1,13 @@
 from sqlalchemy import create_engine,text, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # from credentials import *
+import logging
 import os
+import threading
+import time
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -28,6 +32,123 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica. Each DB_READ_* setting falls back to the primary's,
+# so pointing DB_READ_HOST (or just DB_READ_NAME) at a second database is enough.
+read_host = os.getenv("DB_READ_HOST")
+read_database_name = os.getenv("DB_READ_NAME")
+READ_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_READ_MAX_LAG_SECONDS", "30"))
+READ_REPLICA_CHECK_SECONDS = float(os.getenv("DB_READ_CHECK_SECONDS", "5"))
+
+read_engine = None
+ReadSessionLocal = None
+if read_host or read_database_name:
+    SQLALCHEMY_READ_DATABASE_URL = (
+        f"postgresql://{os.getenv('DB_READ_USERNAME', username)}:{os.getenv('DB_READ_PASSWORD', password)}"
+        f"@{read_host or remote_host}:{os.getenv('DB_READ_PORT', port)}/{read_database_name or database_name}"
+    )
+    read_engine = create_engine(
+        SQLALCHEMY_READ_DATABASE_URL,
+        pool_pre_ping=True
+    )
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+logger = logging.getLogger(__name__)
+_replica_state = {"healthy": False, "checked_at": None}
+_replica_lock = threading.Lock()
+
+
+def replica_lag_seconds():
+    """Replication lag of the read engine; 0 when it is not a streaming standby."""
+    with read_engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT CASE
+                WHEN NOT pg_is_in_recovery() THEN 0
+                WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+            END
+        """)).scalar()
+
+
+def replica_is_usable():
+    """Whether reads may go to the replica, re-checking lag at most every few seconds."""
+    if read_engine is None:
+        return False
+
+    with _replica_lock:
+        checked_at = _replica_state["checked_at"]
+        if checked_at is not None and time.monotonic() - checked_at < READ_REPLICA_CHECK_SECONDS:
+            return _replica_state["healthy"]
+        _replica_state["checked_at"] = time.monotonic()
+
+    try:
+        lag = replica_lag_seconds()
+        healthy = lag <= READ_REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            logger.warning(f"Read replica lagging {lag:.1f}s; routing reads to primary.")
+    except Exception as e:
+        logger.warning(f"Read replica unavailable; routing reads to primary: {e}")
+        healthy = False
+
+    with _replica_lock:
+        _replica_state["healthy"] = healthy
+    return healthy
+
+
+def mark_replica_unhealthy(error=None):
+    """Route reads to the primary until the next scheduled health probe."""
+    logger.warning(f"Read replica failed; routing reads to primary: {error}")
+    with _replica_lock:
+        _replica_state["healthy"] = False
+        _replica_state["checked_at"] = time.monotonic()
+
+
+def is_replica_session(db):
+    return read_engine is not None and db.get_bind() is read_engine
+
+
+def ReadSession():
+    """Session for read-only work: the replica when usable, otherwise the primary."""
+    if replica_is_usable():
+        db = ReadSessionLocal()
+        try:
+            db.connection()  # checks out (and pre-pings) a replica connection now
+            return db
+        except OperationalError as e:
+            db.close()
+            mark_replica_unhealthy(e)
+    return SessionLocal()
+
+
+def is_connection_error(e: OperationalError):
+    """True for lost/refused connections, False for query-level errors.
+
+    psycopg2 raises statement timeouts (QueryCanceledError, SQLSTATE 57014) as
+    OperationalError too; those must reach the caller, not be retried on the primary.
+    """
+    if e.connection_invalidated:
+        return True
+    pgcode = getattr(e.orig, "pgcode", None)
+    # No SQLSTATE means the client lost the server; 08xxx are connection
+    # exceptions, 57P01-57P03 are server shutdown / not accepting connections
+    return pgcode is None or pgcode.startswith("08") or pgcode in ("57P01", "57P02", "57P03")
+
+
+def with_read_fallback(db, read):
+    """Run `read(db)`; if the replica's connection fails, retry once on the primary."""
+    try:
+        return read(db)
+    except OperationalError as e:
+        if not is_replica_session(db) or not is_connection_error(e):
+            raise
+        db.rollback()
+        mark_replica_unhealthy(e)
+
+    primary = SessionLocal()
+    try:
+        return read(primary)
+    finally:
+        primary.close()
+
 Base = declarative_base()
 
 # Dependency for FastAPI
@@ -38,6 +159,14 @@ def get_db_session():
     finally:
         db.close()
 
+# Dependency for read-only FastAPI endpoints
+def get_read_db_session():
+    db = ReadSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
 if __name__ == '__main__':
     db = SessionLocal()
 